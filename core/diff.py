@@ -5,6 +5,19 @@ from typing import Dict, List, Tuple
 from .models import Item
 
 PRICE_NOTIFY_THRESHOLD = float(os.getenv("PRICE_NOTIFY_THRESHOLD", "20"))
+# Threshold in hundredths of a percent, for integer-only comparisons
+_THRESH_NUM = int(round(PRICE_NOTIFY_THRESHOLD * 100))
+
+
+def pct_change_tenths(before: int | None, after: int | None) -> int | None:
+    """
+    Absolute price change from before to after in tenths of a percent,
+    rounded half-up using integer math only.
+    Returns None unless both prices are known and positive.
+    """
+    if before is None or after is None or before <= 0 or after <= 0:
+        return None
+    return (abs(after - before) * 1000 + before // 2) // before
 
 
 def diff_items(
@@ -18,15 +31,30 @@ def diff_items(
       (added_items, removed_items, price_changes[(item_after, before_cents, after_cents)])
     """
     new_map = {it.item_id: it for it in current}
-    old_ids = set(previous.keys())
-    new_ids = set(new_map.keys())
 
-    added = [new_map[iid] for iid in new_ids - old_ids]
-    removed = [previous[iid] for iid in old_ids - new_ids]
+    # First run for a wishlist (or an empty fetch): nothing to compare against
+    if not previous:
+        return list(new_map.values()), [], []
+    if not new_map:
+        return [], list(previous.values()), []
+
+    # dict key views support set algebra directly; no intermediate sets needed
+    added = [new_map[iid] for iid in new_map.keys() - previous.keys()]
+    removed = [previous[iid] for iid in previous.keys() - new_map.keys()]
 
     price_changes: List[Tuple[Item, int, int]] = []
 
-    for iid in old_ids & new_ids:
+    # Walk the smaller mapping and probe the larger one for common ids
+    small: Dict[str, Item]
+    big: Dict[str, Item]
+    if len(previous) <= len(new_map):
+        small, big = previous, new_map
+    else:
+        small, big = new_map, previous
+
+    for iid in small:
+        if iid not in big:
+            continue
         old_item = previous[iid]
         new_item = new_map[iid]
         before = old_item.price_cents
@@ -40,13 +68,12 @@ def diff_items(
             price_changes.append((new_item, before, after))
             continue
 
-        # Threshold logic (like your Amazon monitor)
-        if before == 0:
-            pct = 100.0
-        else:
-            pct = abs(after - before) * 100.0 / abs(before)
-
-        if pct >= PRICE_NOTIFY_THRESHOLD:
+        # Threshold logic (like your Amazon monitor), cross-multiplied so
+        # pct = delta * 100 / before never has to be computed as a float.
+        # A change from zero counts as 100%.
+        base = before if before else 1
+        delta = abs(after - before) if before else 1
+        if delta * 10000 >= _THRESH_NUM * base:
             price_changes.append((new_item, before, after))
 
     return added, removed, price_changes
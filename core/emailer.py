@@ -1,8 +1,9 @@
 # core/emailer.py
+import logging
 import os
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from collections.abc import Iterable
+from email.message import EmailMessage
 
 from .logger import get_logger
 
@@ -14,16 +15,87 @@ SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
 SMTP_USER = os.getenv("SMTP_USER", "").strip()
 SMTP_PASS = os.getenv("SMTP_PASS", "").strip()
 SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "false").lower() == "true"
+# Socket timeout (seconds) for every SMTP operation, including QUIT
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
 
 # Global default recipients (comma or semicolon separated)
 _EMAIL_TO_RAW = os.getenv("EMAIL_TO", "").strip()
+_GLOBAL_RECIPIENTS: tuple[str, ...] = tuple(
+    p for p in (x.strip() for x in _EMAIL_TO_RAW.replace(";", ",").split(",")) if p
+)
 
 
-def get_global_recipients() -> list[str]:
-    if not _EMAIL_TO_RAW:
-        return []
-    parts = [p.strip() for p in _EMAIL_TO_RAW.replace(";", ",").split(",")]
-    return [p for p in parts if p]
+def compile_recipient_set(overrides: Iterable[object] = ()) -> tuple[str, ...]:
+    """
+    Normalize a recipient list once so callers can reuse the result.
+
+    Strips entries, drops blanks/non-strings and de-duplicates while keeping
+    order. Falls back to the global EMAIL_TO list when nothing remains.
+    """
+    cleaned = tuple(
+        dict.fromkeys(r.strip() for r in overrides if isinstance(r, str) and r.strip())
+    )
+    return cleaned or _GLOBAL_RECIPIENTS
+
+
+class SMTPSession:
+    """
+    SMTP connection that is opened lazily and reused across sends.
+
+    STARTTLS and LOGIN run once per connection; a NOOP health check before
+    each subsequent send reconnects if the server dropped an idle socket.
+    """
+
+    def __init__(self) -> None:
+        self._server: smtplib.SMTP | None = None
+
+    def __enter__(self) -> "SMTPSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _connect(self) -> smtplib.SMTP:
+        if SMTP_USE_SSL:
+            server: smtplib.SMTP = smtplib.SMTP_SSL(
+                SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT
+            )
+        else:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            if not SMTP_USE_SSL:
+                server.starttls()
+            if SMTP_USER:
+                server.login(SMTP_USER, SMTP_PASS)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _is_alive(self) -> bool:
+        if self._server is None:
+            return False
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, msg: EmailMessage, recipients: list[str]) -> None:
+        if not self._is_alive():
+            self.close()
+            self._server = self._connect()
+        assert self._server is not None
+        self._server.send_message(msg, to_addrs=recipients)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        try:
+            server.quit()
+        except Exception:
+            # QUIT was not acknowledged; drop the socket without waiting
+            server.close()
 
 
 def send_email(
@@ -31,6 +103,7 @@ def send_email(
     html_body: str,
     text_body: str | None,
     recipients: list[str],
+    session: SMTPSession | None = None,
 ):
     if not recipients:
         logger.warning(
@@ -45,34 +118,20 @@ def send_email(
         )
         return
 
-    msg = MIMEMultipart("alternative")
-    msg["From"] = EMAIL_FROM
-    msg["To"] = ", ".join(recipients)
-    msg["Subject"] = subject
-
     if not text_body:
         text_body = "HTML capable email client required to view this report."
 
-    part_text = MIMEText(text_body, "plain", "utf-8")
-    part_html = MIMEText(html_body, "html", "utf-8")
-
-    msg.attach(part_text)
-    msg.attach(part_html)
+    msg = EmailMessage()
+    msg["From"] = EMAIL_FROM
+    msg["To"] = ", ".join(recipients)
+    msg["Subject"] = subject
+    msg.set_content(text_body)
+    msg.add_alternative(html_body, subtype="html")
 
-    if SMTP_USE_SSL:
-        server: smtplib.SMTP_SSL | smtplib.SMTP = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+    if session is None:
+        with SMTPSession() as one_shot:
+            one_shot.send(msg, recipients)
     else:
-        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-
-    try:
-        if not SMTP_USE_SSL:
-            server.starttls()
-        if SMTP_USER:
-            server.login(SMTP_USER, SMTP_PASS)
-        server.sendmail(EMAIL_FROM, recipients, msg.as_string())
+        session.send(msg, recipients)
+    if logger.isEnabledFor(logging.INFO):
         logger.info("Email sent to %s: %s", recipients, subject)
-    finally:
-        try:
-            server.quit()
-        except Exception:
-            pass
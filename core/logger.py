@@ -2,16 +2,39 @@
 import logging
 import os
 import sys
+import time
 from logging.handlers import RotatingFileHandler
 
 _configured = False
 
 
+class _FastFormatter(logging.Formatter):
+    """Formatter that runs strftime at most once per second of log time."""
+
+    # (second, formatted string) in one tuple so threads logging through
+    # different handlers never see a second paired with another's string
+    _cache: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        cached = self._cache
+        if cached[0] != sec:
+            cached = self._cache = (sec, time.strftime("%Y-%m-%d %H:%M:%S", self.converter(sec)))
+        return "%s,%03d" % (cached[1], record.msecs)
+
+
 def setup_logging():
     global _configured
     if _configured:
         return
 
+    # The formatter never uses thread/process fields; skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     log_to_file = os.getenv("LOG_TO_FILE", "true").lower() == "true"
     log_file = os.getenv("LOG_FILE", "/data/wishlist_monitor.log")
@@ -22,7 +45,7 @@ def setup_logging():
     root = logging.getLogger()
     root.setLevel(getattr(logging, log_level, logging.INFO))
 
-    formatter = logging.Formatter(
+    formatter = _FastFormatter(
         "%(asctime)s %(levelname)s [%(name)s] %(message)s"
     )
 
@@ -2,7 +2,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """
     Normalized representation of a wishlist item across all platforms.
@@ -0,0 +1,70 @@
+# core/ratelimit.py
+import fcntl
+import os
+import struct
+import threading
+import time
+
+# A shared slot further ahead than this can only come from a wall-clock step
+# backwards (or a stale file), not from other processes queueing; ignore it.
+_MAX_SHARED_AHEAD = 3600.0
+
+
+class SpacingLimiter:
+    """
+    Enforce a minimum interval between operations, shared across threads.
+
+    Each caller reserves the next free slot under a lock and then sleeps
+    outside it, so concurrent callers queue up one interval apart instead of
+    racing on a shared "last fetch" timestamp.
+
+    With burst > 1 this behaves as a token bucket of that capacity refilling
+    one token per interval (tracked GCRA-style as a single "next slot"
+    timestamp): after an idle period up to burst operations go through
+    back to back, while the sustained rate stays at one per interval.
+
+    With state_path set, the next free slot is also kept in that file under
+    an flock, so separate processes (e.g. a MODE=once run next to the daemon)
+    share the same spacing.
+    """
+
+    def __init__(self, interval: float, state_path: str | None = None, burst: int = 1) -> None:
+        self.interval = interval
+        self.state_path = state_path
+        self.burst = max(burst, 1)
+        self._next_slot = float("-inf")
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim the next slot and return how many seconds to wait for it."""
+        with self._lock:
+            if self.state_path:
+                return self._reserve_shared(self.state_path)
+            now = time.monotonic()
+            slot, self._next_slot = self._claim(now, self._next_slot)
+        return slot - now
+
+    def _claim(self, now: float, next_slot: float) -> tuple[float, float]:
+        """Return (slot granted to this caller, next slot to store)."""
+        # The bucket's next slot may run up to burst-1 intervals ahead of
+        # the slot handed out
+        next_slot = max(now, next_slot)
+        burst_window = (self.burst - 1) * self.interval
+        return max(now, next_slot - burst_window), next_slot + self.interval
+
+    def _reserve_shared(self, path: str) -> float:
+        # Wall-clock time, since monotonic clocks aren't comparable across
+        # processes that may outlive a reboot
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, 8, 0)
+            next_slot = struct.unpack("d", raw)[0] if len(raw) == 8 else float("-inf")
+            now = time.time()
+            if next_slot - now > _MAX_SHARED_AHEAD:
+                next_slot = now
+            slot, next_slot = self._claim(now, next_slot)
+            os.pwrite(fd, struct.pack("d", next_slot), 0)
+        finally:
+            os.close(fd)  # also releases the flock
+        return slot - now
@@ -1,22 +1,53 @@
+# core/report_html.py
 import os
 from pathlib import Path
 from typing import List, Tuple
-from jinja2 import Environment, FileSystemLoader
-from core.models import Item
+
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
+
+from .diff import pct_change_tenths
+from .models import Item
 
 TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
-env = Environment(loader=FileSystemLoader(str(TEMPLATE_DIR)))
+
+# Templates ship with the image and never change at runtime, so skip the
+# per-render mtime check and persist compiled bytecode across runs (in
+# Jinja's own per-user cache dir, which it checks for ownership and 0700).
+# Item names/URLs come from scraped pages, so HTML templates autoescape.
+env = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=False,
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
 
 EMAIL_THEME = os.getenv("EMAIL_THEME", "dark").strip().lower()
 if EMAIL_THEME not in ("light", "dark"):
     EMAIL_THEME = "dark"
 
 
+_CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£"}
+
+
 def _cents_to_str(cents: int | None, currency: str = "USD") -> str:
     if cents is None or cents < 0:
         return "Unavailable"
-    sym = "$" if currency == "USD" else ""
-    return f"{sym}{cents / 100:.2f}"
+    whole, frac = divmod(cents, 100)
+    sym = _CURRENCY_SYMBOLS.get(currency)
+    if sym is not None:
+        return f"{sym}{whole}.{frac:02d}"
+    return f"{whole}.{frac:02d} {currency}"
+
+
+# Items are passed to the template as-is; prices are formatted on render.
+env.filters["price"] = _cents_to_str
+_TPL_HTML = env.get_template(f"email_{EMAIL_THEME}.html")
 
 
 def build_html_report(
@@ -31,39 +62,22 @@ def build_html_report(
     wishlist_url: str | None = None,
 ) -> str:
 
-    template = env.get_template(f"email_{EMAIL_THEME}.html")
-
-    added_data = [
-        {
-            "name": it.name,
-            "price_str": _cents_to_str(it.price_cents, it.currency),
-            "image_url": it.image_url,
-            "product_url": it.product_url,
-        }
-        for it in added
-    ]
-
-    removed_data = [{"name": it.name} for it in removed]
-
     price_change_data = []
     for it, before, after in price_changes:
-        before_str = _cents_to_str(before, it.currency)
-        after_str = _cents_to_str(after, it.currency)
+        currency = it.currency
+        before_str = _cents_to_str(before, currency)
+        after_str = _cents_to_str(after, currency)
         pct_str = ""
         color = "#BDC1C6"
-        if before and before > 0 and after and after > 0:
-            delta = after - before
-            pct = abs(delta) * 100 / abs(before)
-            sign = "+" if delta > 0 else "-"
-            pct_str = f"({sign}{pct:.1f}%)"
-            color = "#FF6B6B" if delta > 0 else "#81C995"
+        tenths = pct_change_tenths(before, after)
+        if tenths is not None:
+            increased = after > before
+            sign = "+" if increased else "-"
+            pct_str = f"({sign}{tenths // 10}.{tenths % 10}%)"
+            color = "#FF6B6B" if increased else "#81C995"
         price_change_data.append(
             {
-                "item": {
-                    "name": it.name,
-                    "image_url": it.image_url,
-                    "product_url": it.product_url,
-                },
+                "item": it,
                 "before_str": before_str,
                 "after_str": after_str,
                 "pct_str": pct_str,
@@ -77,13 +91,13 @@ def build_html_report(
         f"Previous: {previous_count} · Current: {new_count}</div>"
     )
 
-    return template.render(
+    return _TPL_HTML.render(
         platform=platform,
         wishlist_name=wishlist_name,
         wishlist_id=wishlist_id,
         summary_html=summary_html,
-        added=added_data,
-        removed=removed_data,
+        added=added,
+        removed=removed,
         price_changes=price_change_data,
         title=f"{platform.capitalize()} Wishlist Update: {wishlist_name}",
         wishlist_url=wishlist_url,
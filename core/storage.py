@@ -2,7 +2,8 @@
 import os
 import sqlite3
 import datetime
-import pytz
+import threading
+from operator import attrgetter
 from typing import Dict, List, Tuple
 
 from .models import Item
@@ -12,75 +13,149 @@ logger = get_logger(__name__)
 
 DB_PATH = os.getenv("DB_PATH", "/data/wishlist_state.sqlite3")
 
+# WAL turns each commit into a sequential append; synchronous=NORMAL is
+# durable under WAL except for the very last commits on power loss.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA journal_size_limit=6144000",
+)
+
+# Statement text is kept in module constants so every call hits the same
+# entry in the connection's prepared-statement cache.
+_SELECT_ITEMS_SQL = """
+    SELECT item_id, name, price_cents, currency, product_url, image_url, available
+    FROM items
+    WHERE platform=? AND wishlist_id=?
+"""
+
+_COUNT_ITEMS_SQL = "SELECT COUNT(*) FROM items WHERE platform=? AND wishlist_id=?"
+
+_UPSERT_ITEM_SQL = """
+    INSERT INTO items (
+        platform, wishlist_id, item_id, name, price_cents, currency,
+        product_url, image_url, available, first_seen, last_seen
+    )
+    VALUES (?,?,?,?,?,?,?,?,?,?,?)
+    ON CONFLICT(platform, wishlist_id, item_id) DO UPDATE SET
+        name=excluded.name,
+        price_cents=excluded.price_cents,
+        currency=excluded.currency,
+        product_url=excluded.product_url,
+        image_url=excluded.image_url,
+        available=excluded.available,
+        last_seen=excluded.last_seen
+"""
+
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (
+        ts, platform, wishlist_id, event_type,
+        item_id, name, from_price_cents, to_price_cents
+    )
+    VALUES (?,?,?,?,?,?,?,?)
+"""
+
+# Pulls the bound item columns in one C-level call per row; sqlite3 stores
+# the bool `available` as 0/1.
+_item_columns = attrgetter(
+    "item_id", "name", "price_cents", "currency", "product_url", "image_url", "available"
+)
+
+# Max item ids per DELETE ... IN (...); SQLite's default limit is 999 variables
+_DELETE_CHUNK = 500
+
+_TOUCH_ITEMS_SQL = "UPDATE items SET last_seen=? WHERE platform=? AND wishlist_id=?"
+
+_local = threading.local()
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Return this thread's long-lived connection, opening it on first use.
 
-def _connect():
-    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-    return sqlite3.connect(DB_PATH)
+    Reusing the connection keeps SQLite's page cache warm between polls.
+    The connection is in autocommit mode (isolation_level=None): every
+    statement commits on its own and ``with con:`` neither opens nor rolls
+    back a transaction. Callers that need atomicity issue BEGIN/COMMIT
+    themselves, as save_items_and_events does.
+    """
+    con: sqlite3.Connection | None = getattr(_local, "con", None)
+    if con is None:
+        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        # Autocommit mode: writers manage their own BEGIN/COMMIT
+        con = sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=256)
+        for pragma in _PRAGMAS:
+            con.execute(pragma)
+        _local.con = con
+    return con
 
 
 def now_utc_iso() -> str:
-    return datetime.datetime.now(tz=pytz.UTC).isoformat()
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
 
 def ensure_db():
-    with _connect() as con:
-        cur = con.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS items (
-                platform TEXT,
-                wishlist_id TEXT,
-                item_id TEXT,
-                name TEXT,
-                price_cents INTEGER,
-                currency TEXT,
-                product_url TEXT,
-                image_url TEXT,
-                available INTEGER,
-                first_seen TEXT,
-                last_seen TEXT,
-                PRIMARY KEY (platform, wishlist_id, item_id)
-            )
+    con = _connect()
+    cur = con.cursor()
+    cur.execute(
         """
+        CREATE TABLE IF NOT EXISTS items (
+            platform TEXT,
+            wishlist_id TEXT,
+            item_id TEXT,
+            name TEXT,
+            price_cents INTEGER,
+            currency TEXT,
+            product_url TEXT,
+            image_url TEXT,
+            available INTEGER,
+            first_seen TEXT,
+            last_seen TEXT,
+            PRIMARY KEY (platform, wishlist_id, item_id)
         )
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT,
-                platform TEXT,
-                wishlist_id TEXT,
-                event_type TEXT,   -- added|removed|price_change
-                item_id TEXT,
-                name TEXT,
-                from_price_cents INTEGER,
-                to_price_cents INTEGER
-            )
+    """
+    )
+    # The PK already serves (platform, wishlist_id) lookups; this covering
+    # index lets get_previous_items read every column without touching
+    # the table b-tree.
+    cur.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_items_cover ON items (
+            platform, wishlist_id, item_id, name, price_cents, currency,
+            product_url, image_url, available
+        )
+    """
+    )
+    cur.execute(
         """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT,
+            platform TEXT,
+            wishlist_id TEXT,
+            event_type TEXT,   -- added|removed|price_change
+            item_id TEXT,
+            name TEXT,
+            from_price_cents INTEGER,
+            to_price_cents INTEGER
         )
-        con.commit()
+    """
+    )
 
 
 def get_previous_items(platform: str, wishlist_id: str) -> Dict[str, Item]:
     """
     Return mapping item_id -> Item for existing DB entries.
     """
-    with _connect() as con:
-        cur = con.cursor()
-        cur.execute(
-            """
-            SELECT item_id, name, price_cents, currency, product_url, image_url, available
-            FROM items
-            WHERE platform=? AND wishlist_id=?
-        """,
-            (platform, wishlist_id),
-        )
-        rows = cur.fetchall()
-
-    out: Dict[str, Item] = {}
-    for row in rows:
-        item_id, name, price_cents, currency, product_url, image_url, available = row
-        out[item_id] = Item(
+    con = _connect()
+    cur = con.cursor()
+    cur.execute(_SELECT_ITEMS_SQL, (platform, wishlist_id))
+    # Build the mapping straight from the cursor; no intermediate row list
+    return {
+        item_id: Item(
             item_id=item_id,
             name=name,
             price_cents=price_cents,
@@ -89,17 +164,15 @@ def get_previous_items(platform: str, wishlist_id: str) -> Dict[str, Item]:
             image_url=image_url or "",
             available=bool(available),
         )
-    return out
+        for item_id, name, price_cents, currency, product_url, image_url, available in cur
+    }
 
 
 def get_previous_item_count(platform: str, wishlist_id: str) -> int:
-    with _connect() as con:
-        cur = con.cursor()
-        cur.execute(
-            "SELECT COUNT(*) FROM items WHERE platform=? AND wishlist_id=?",
-            (platform, wishlist_id),
-        )
-        row = cur.fetchone()
+    con = _connect()
+    cur = con.cursor()
+    cur.execute(_COUNT_ITEMS_SQL, (platform, wishlist_id))
+    row = cur.fetchone()
     return row[0] if row and row[0] is not None else 0
 
 
@@ -110,115 +183,70 @@ def save_items_and_events(
     added: List[Item],
     removed: List[Item],
     price_changes: List[Tuple[Item, int, int]],
+    previous: Dict[str, Item] | None = None,
 ):
     """
     Persist current items and diff events into SQLite.
+
+    When ``previous`` (as returned by get_previous_items) is given, only new
+    or changed items are upserted; unchanged rows just get last_seen bumped.
     """
     ts = now_utc_iso()
-    with _connect() as con:
-        cur = con.cursor()
-
-        # Upsert all current items
-        for it in new_items:
-            cur.execute(
-                """
-                INSERT INTO items (
-                    platform, wishlist_id, item_id, name, price_cents, currency,
-                    product_url, image_url, available, first_seen, last_seen
-                )
-                VALUES (?,?,?,?,?,?,?,?,?,?,?)
-                ON CONFLICT(platform, wishlist_id, item_id) DO UPDATE SET
-                    name=excluded.name,
-                    price_cents=excluded.price_cents,
-                    currency=excluded.currency,
-                    product_url=excluded.product_url,
-                    image_url=excluded.image_url,
-                    available=excluded.available,
-                    last_seen=excluded.last_seen
-            """,
-                (
-                    platform,
-                    wishlist_id,
-                    it.item_id,
-                    it.name,
-                    it.price_cents,
-                    it.currency,
-                    it.product_url,
-                    it.image_url,
-                    1 if it.available else 0,
-                    ts,
-                    ts,
-                ),
-            )
-
-        # Events for added
-        for it in added:
-            cur.execute(
-                """
-                INSERT INTO events (
-                    ts, platform, wishlist_id, event_type,
-                    item_id, name, from_price_cents, to_price_cents
-                )
-                VALUES (?,?,?,?,?,?,?,?)
-            """,
-                (
-                    ts,
-                    platform,
-                    wishlist_id,
-                    "added",
-                    it.item_id,
-                    it.name,
-                    None,
-                    it.price_cents,
-                ),
-            )
+    if previous is None:
+        changed_items = new_items
+    else:
+        changed_items = [it for it in new_items if previous.get(it.item_id) != it]
+
+    con = _connect()
+    cur = con.cursor()
+
+    # One explicit write transaction (and one WAL sync) for the whole batch
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        # Upsert new/changed items
+        cur.executemany(
+            _UPSERT_ITEM_SQL,
+            [(platform, wishlist_id, *_item_columns(it), ts, ts) for it in changed_items],
+        )
 
-        # Events for price changes
-        for it, before, after in price_changes:
-            cur.execute(
-                """
-                INSERT INTO events (
-                    ts, platform, wishlist_id, event_type,
-                    item_id, name, from_price_cents, to_price_cents
-                )
-                VALUES (?,?,?,?,?,?,?,?)
-            """,
-                (
-                    ts,
-                    platform,
-                    wishlist_id,
-                    "price_change",
-                    it.item_id,
-                    it.name,
-                    before,
-                    after,
-                ),
-            )
+        # Events for added, price changes and removed
+        cur.executemany(
+            _INSERT_EVENT_SQL,
+            [
+                (ts, platform, wishlist_id, "added", it.item_id, it.name, None, it.price_cents)
+                for it in added
+            ],
+        )
+        cur.executemany(
+            _INSERT_EVENT_SQL,
+            [
+                (ts, platform, wishlist_id, "price_change", it.item_id, it.name, before, after)
+                for it, before, after in price_changes
+            ],
+        )
+        cur.executemany(
+            _INSERT_EVENT_SQL,
+            [
+                (ts, platform, wishlist_id, "removed", it.item_id, it.name, None, None)
+                for it in removed
+            ],
+        )
 
-        # Events + deletion for removed
-        for it in removed:
-            cur.execute(
-                """
-                INSERT INTO events (
-                    ts, platform, wishlist_id, event_type,
-                    item_id, name, from_price_cents, to_price_cents
-                )
-                VALUES (?,?,?,?,?,?,?,?)
-            """,
-                (
-                    ts,
-                    platform,
-                    wishlist_id,
-                    "removed",
-                    it.item_id,
-                    it.name,
-                    None,
-                    None,
-                ),
-            )
+        # Deletion for removed, chunked to stay under SQLite's variable limit
+        removed_ids = [it.item_id for it in removed]
+        for start in range(0, len(removed_ids), _DELETE_CHUNK):
+            chunk = removed_ids[start:start + _DELETE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
             cur.execute(
-                "DELETE FROM items WHERE platform=? AND wishlist_id=? AND item_id=?",
-                (platform, wishlist_id, it.item_id),
+                f"DELETE FROM items WHERE platform=? AND wishlist_id=? "
+                f"AND item_id IN ({placeholders})",
+                (platform, wishlist_id, *chunk),
             )
 
-        con.commit()
+        # Everything left for this wishlist was seen in this fetch
+        if previous is not None:
+            cur.execute(_TOUCH_ITEMS_SQL, (ts, platform, wishlist_id))
+    except BaseException:
+        cur.execute("ROLLBACK")
+        raise
+    cur.execute("COMMIT")
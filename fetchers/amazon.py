@@ -1,21 +1,26 @@
 import datetime
+import email.utils
+import functools
 import logging
-import math
 import os
 import random
 import re
 import time
+from collections.abc import Container
 from pathlib import Path
-from typing import Iterable
 
 from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+from urllib3.util.retry import Retry
 from bs4.element import Tag
 
 from core.logger import get_logger
 from core.models import Item
+from core.ratelimit import SpacingLimiter
 
 logger = get_logger(__name__)
 
@@ -24,7 +29,13 @@ DEBUG_DIR = Path(os.getenv("DEBUG_DIR", "/data/debug_dumps"))
 
 # Global Amazon fetch spacing (seconds between any two wishlist page fetches)
 AMAZON_MIN_SPACING = int(os.getenv("AMAZON_MIN_SPACING", "45"))
-_last_amazon_fetch_ts: float = 0.0
+# Optional file that carries the spacing across processes sharing a volume
+AMAZON_SPACING_FILE = os.getenv("AMAZON_SPACING_FILE", "").strip()
+# Fetches allowed back to back after an idle spell; 1 keeps a strict floor
+AMAZON_BURST = int(os.getenv("AMAZON_BURST", "1"))
+# Ceiling for the spacing while Amazon is throttling us (see _adapt_spacing)
+AMAZON_MAX_SPACING = int(os.getenv("AMAZON_MAX_SPACING", str(AMAZON_MIN_SPACING * 4)))
+_AMAZON_LIMITER = SpacingLimiter(AMAZON_MIN_SPACING, AMAZON_SPACING_FILE or None, AMAZON_BURST)
 
 # Per-page / retry behaviour
 AMAZON_MAX_PAGES = int(os.getenv("AMAZON_MAX_PAGES", "50"))
@@ -33,33 +44,114 @@ CAPTCHA_SLEEP = int(os.getenv("CAPTCHA_SLEEP", "900"))
 FAIL_SLEEP = int(os.getenv("FAIL_SLEEP", "30"))
 PAGE_SLEEP = int(os.getenv("PAGE_SLEEP", "5"))
 
+# HTML parser for wishlist pages: "lexbor" (selectolax, default) or "bs4"
+# (BeautifulSoup + lxml) as a fallback for markup lexbor mishandles.
+AMAZON_PARSER = os.getenv("AMAZON_PARSER", "lexbor").strip().lower()
+
 DEBUG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Shared session so keep-alive connections (and their TLS handshakes) and the
+# request headers are reused across pages and wishlists. The adapter only
+# retries transport errors: status=0 and respect_retry_after_header=False stop
+# urllib3 from retrying (and sleeping on Retry-After for) 413/429/503, so HTTP
+# status handling, spacing and backoff all stay in fetch_items.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=1,
+            status=0,
+            status_forcelist=(),
+            respect_retry_after_header=False,
+        ),
+    ),
+)
+_SESSION.headers.update(
+    {
+        "User-Agent": (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) "
+            "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 "
+            "Mobile/15A372 Safari/604.1"
+        ),
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Referer": "https://www.amazon.com/",
+    }
+)
+
+_ITEM_CONTAINER_SELECTOR = "li.awl-item-wrapper, li.g-item-sortable, div.g-item-sortable"
+_SHOW_MORE_SELECTOR = "form.scroll-state input.showMoreUrl"
+
+_HZ_WISHLIST_RE = re.compile(r"/hz/wishlist/ls/([A-Za-z0-9]+)/?")
+_GP_REGISTRY_RE = re.compile(r"/gp/registry/(?:wishlist|list)/([A-Za-z0-9]+)/?")
+
+# One case-insensitive scan over the raw page bytes, with no decoded or
+# lowercased copy of the page
+_CAPTCHA_RE = re.compile(
+    rb"robot check"
+    rb"|enter the characters you see below"
+    rb"|/errors/validatecaptcha"
+    rb"|to discuss automated access to amazon data"
+    rb"|type the characters you see in this image",
+    re.IGNORECASE,
+)
+
+# Anything but alphanumerics (str.isalnum) and "._-"
+_UNSAFE_FILENAME_RE = re.compile(r"[^\w.-]")
+
 
 class AmazonError(Exception):
     """Generic Amazon fetch error."""
 
+    def __init__(self, message: str, retry_after: float | None = None, status: int | None = None) -> None:
+        super().__init__(message)
+        # Delay requested by the server's Retry-After header, in seconds
+        self.retry_after = retry_after
+        self.status = status
+
+
+def _retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
 
+@functools.lru_cache(maxsize=128)
 def _sanitize(name: str) -> str:
     """Normalize arbitrary wishlist names/IDs to be filesystem-safe."""
-    return "".join(ch if ch.isalnum() or ch in "._-" else "_" for ch in name)
+    return _UNSAFE_FILENAME_RE.sub("_", name)
 
 
-def _dump_html(wishlist_name: str | None, page_index: int, html: str) -> None:
+def _dump_html(wishlist_name: str | None, page_index: int, html: bytes) -> None:
     """Write HTML to a timestamped file when DEBUG logging is enabled."""
     if not logger.isEnabledFor(logging.DEBUG):
         return
 
-    timestamp = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
     safe = _sanitize(wishlist_name or "unknown")
     path = DEBUG_DIR / f"amazon_{safe}_page{page_index}_{timestamp}.html"
     try:
-        path.write_text(html, encoding="utf-8")
+        path.write_bytes(html)
         logger.debug("Dumped Amazon HTML to %s", path)
     except Exception as exc:  # pragma: no cover - defensive
         logger.debug("Failed to dump Amazon HTML to %s: %s", path, exc)
 
 
+@functools.lru_cache(maxsize=256)
 def normalize_wishlist_url(url: str) -> str:
     """
     Normalize various Amazon wishlist URLs to the mobile wishlist URL format.
@@ -69,9 +161,9 @@ def normalize_wishlist_url(url: str) -> str:
       - https://www.amazon.com/gp/registry/wishlist/XXXXXXXXXXXX
       - https://www.amazon.com/gp/registry/list/XXXXXXXXXXXX
     """
-    m = re.search(r"/hz/wishlist/ls/([A-Za-z0-9]+)/?", url)
+    m = _HZ_WISHLIST_RE.search(url)
     if not m:
-        m = re.search(r"/gp/registry/(?:wishlist|list)/([A-Za-z0-9]+)/?", url)
+        m = _GP_REGISTRY_RE.search(url)
     if m:
         lid = m.group(1)
         return f"{BASE_URL}/gp/aw/ls?lid={lid}&ty=wishlist"
@@ -79,6 +171,15 @@ def normalize_wishlist_url(url: str) -> str:
 
 
 def ensure_absolute_url(url: str) -> str:
+    # Prefix checks cover what Amazon actually serves; urlparse is only
+    # reached for odd shapes
+    if url.startswith(("https://", "http://")):
+        return url
+    if url.startswith("//"):
+        # protocol-relative (CDN images)
+        return f"https:{url}"
+    if url.startswith("/"):
+        return f"{BASE_URL}{url}"
     parsed = urlparse(url)
     if parsed.scheme and parsed.netloc:
         return url
@@ -88,126 +189,146 @@ def ensure_absolute_url(url: str) -> str:
     return f"{BASE_URL}{url}"
 
 
-def looks_like_captcha_or_block(html: str) -> bool:
+def looks_like_captcha_or_block(html: bytes) -> bool:
     """Heuristically detect Robot Check / CAPTCHA / blocked pages on mobile."""
-    lower = html.lower()
-    if "robot check" in lower:
-        return True
-    if "enter the characters you see below" in lower:
-        return True
-    if "/errors/validatecaptcha" in lower:
-        return True
-    if "to discuss automated access to amazon data" in lower:
-        return True
-    if "type the characters you see in this image" in lower:
-        return True
-    return False
-
-
-def fetch_page_raw(session: requests.Session, url: str, headers: dict[str, str]) -> str:
-    """Fetch a single Amazon wishlist page."""
-    logger.debug("Fetching Amazon page: %s", url)
-    resp = session.get(url, headers=headers, timeout=30)
-    status = resp.status_code
-    text = resp.text
-
-    if status == 503:
-        logger.warning(
-            "Amazon returned 503 at %s (possible CAPTCHA or rate limiting).",
-            url,
-        )
-        raise AmazonError("503 Service Unavailable")
+    return _CAPTCHA_RE.search(html) is not None
 
-    if status != 200:
-        logger.warning("Amazon returned status %s at %s.", status, url)
-        raise AmazonError(f"Bad status code {status}")
 
-    return text
+def fetch_page_raw(session: requests.Session, url: str, headers: dict[str, str] | None = None) -> bytes:
+    """Fetch a single Amazon wishlist page as undecoded bytes."""
+    logger.debug("Fetching Amazon page: %s", url)
+    # Stream so error responses are rejected from the status line alone,
+    # without downloading and decompressing their bodies.
+    with session.get(url, headers=headers, timeout=30, stream=True) as resp:
+        status = resp.status_code
+
+        if status != 200:
+            retry_after = _retry_after_seconds(resp.headers.get("Retry-After"))
+            if status == 503:
+                logger.warning(
+                    "Amazon returned 503 at %s (possible CAPTCHA or rate limiting).",
+                    url,
+                )
+                raise AmazonError("503 Service Unavailable", retry_after, status)
+            logger.warning("Amazon returned status %s at %s.", status, url)
+            raise AmazonError(f"Bad status code {status}", retry_after, status)
+
+        # Raw bytes: the parsers take the charset from the page itself, so
+        # requests' own decoding (and charset guessing) is skipped.
+        return resp.content
 
 
 def _text_or_empty(tag: Tag | None) -> str:
     return tag.get_text(strip=True) if tag is not None else ""
 
 
-def _select_first(root: Tag | BeautifulSoup, selectors: Iterable[str]) -> Tag | None:
-    """Select the first tag that matches any of the given CSS selectors."""
-    for sel in selectors:
-        found = root.select_one(sel)
-        if found is not None:
-            return found
-    return None
-
+# Title candidates in priority order, as keys recorded by _scan_item_li
+_TITLE_KEYS = ("h3", "h2", ".awl-item-title", "span.a-size-base", "span.a-size-medium")
 
-def parse_item_li(li: Tag) -> Item:
-    """Parse a single wishlist item block into an Item."""
-    item_id = str(li.get("id") or "")
 
+def _scan_item_li(li: Tag) -> dict[str, Tag]:
+    """
+    Walk an item block once and record the first descendant matching each
+    field of interest (image, /dp/ link, title candidates, price parts).
+    """
+    found: dict[str, Tag] = {}
+    for el in li.find_all(True):
+        tag = el.name
+        classes = el.get("class") or ()
+        if tag == "img":
+            found.setdefault("img", el)
+        elif tag == "a":
+            href = el.get("href")
+            if isinstance(href, str) and "/dp/" in href:
+                found.setdefault("link", el)
+        elif tag in ("h3", "h2"):
+            found.setdefault(tag, el)
+        elif tag == "span":
+            if "a-size-base" in classes:
+                found.setdefault("span.a-size-base", el)
+            if "a-size-medium" in classes:
+                found.setdefault("span.a-size-medium", el)
+        if "awl-item-title" in classes:
+            found.setdefault(".awl-item-title", el)
+        if "a-price-whole" in classes:
+            found.setdefault("price_whole", el)
+        if "a-price-fraction" in classes:
+            found.setdefault("price_fraction", el)
+    return found
+
+
+def _price_cents_from_str(raw: str) -> int:
+    """
+    Convert a decimal price string such as "19.99" to integer cents without a
+    float round-trip (half-up past two decimals). Anything that is not a plain
+    decimal number, e.g. "-Infinity", raises ValueError.
+    """
+    raw = raw.strip()
+    sign = -1 if raw.startswith("-") else 1
+    whole, _, frac = raw.lstrip("+-").partition(".")
+    if not (whole or frac) or not (whole or "0").isdigit() or (frac and not frac.isdigit()):
+        raise ValueError(f"not a decimal price: {raw!r}")
+    cents = int(whole or "0") * 100 + int(frac[:2].ljust(2, "0"))
+    if frac[2:3] >= "5":
+        cents += 1
+    return sign * cents
+
+
+def _build_item(
+    item_id: str,
+    image_src: str | None,
+    href: str | None,
+    title: str,
+    raw_price: str | None,
+    price_whole: str | None,
+    price_fraction: str | None,
+) -> Item:
+    """Turn the raw strings pulled from an item block into an Item."""
     # Image
-    image_url = ""
-    img_el = li.select_one("img")
-    if img_el is not None:
-        src_val = img_el.get("src")
-        if isinstance(src_val, str) and src_val:
-            image_url = ensure_absolute_url(src_val)
-
-    # URL
-    product_url = ""
-    url_el = li.select_one("a[href*='/dp/']")
-    if url_el is not None:
-        href_val = url_el.get("href")
-        if isinstance(href_val, str) and href_val:
-            # strip query for stability
-            href_clean = href_val.split("?", 1)[0]
-            product_url = ensure_absolute_url(href_clean)
+    image_url = ensure_absolute_url(image_src) if image_src else ""
+
+    # URL (strip query for stability)
+    product_url = ensure_absolute_url(href.split("?", 1)[0]) if href else ""
 
     # Title
-    title_el = _select_first(li, ["h3", "h2", ".awl-item-title", "span.a-size-base", "span.a-size-medium"])
-    name = _text_or_empty(title_el) or item_id
+    name = title or item_id
 
     # Price: prefer data-price on container when present
     price_cents = -1
     currency = "USD"
 
-    raw_price_val = li.get("data-price")
-    raw_price_str = str(raw_price_val) if isinstance(raw_price_val, (str, int, float)) else None
-    if raw_price_str:
+    if raw_price:
         try:
-            price_value = float(raw_price_str)
-            if math.isfinite(price_value):
-                price_cents = int(round(price_value * 100))
-            else:
-                logger.debug("Non-finite price %r for item %s", raw_price_str, item_id)
+            price_cents = _price_cents_from_str(raw_price)
         except ValueError:
-            logger.debug("Failed to parse data-price %r for item %s", raw_price_str, item_id)
-    else:
+            logger.debug("Failed to parse data-price %r for item %s", raw_price, item_id)
+    elif price_whole is not None:
         # Fallback to whole + fraction layout
-        pw = li.select_one(".a-price-whole")
-        pf = li.select_one(".a-price-fraction")
-        if pw is not None:
-            whole_str = _text_or_empty(pw).replace(",", "")
-            frac_str = _text_or_empty(pf) if pf is not None else "00"
-            try:
-                whole_val = int(whole_str)
-                frac_val = int(frac_str)
-                price_cents = whole_val * 100 + frac_val
-            except ValueError:
-                logger.debug(
-                    "Failed to parse price from whole=%r fraction=%r for item %s",
-                    whole_str,
-                    frac_str,
-                    item_id,
-                )
+        whole_str = price_whole.replace(",", "")
+        frac_str = price_fraction if price_fraction is not None else "00"
+        try:
+            whole_val = int(whole_str)
+            frac_val = int(frac_str[:2].ljust(2, "0"))
+            price_cents = whole_val * 100 + frac_val
+        except ValueError:
+            logger.debug(
+                "Failed to parse price from whole=%r fraction=%r for item %s",
+                whole_str,
+                frac_str,
+                item_id,
+            )
 
     available = price_cents >= 0
 
-    logger.debug(
-        "Parsed item: id=%s, name=%s, price_cents=%d, url=%s, image=%s",
-        item_id,
-        name,
-        price_cents,
-        product_url,
-        image_url,
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Parsed item: id=%s, name=%s, price_cents=%d, url=%s, image=%s",
+            item_id,
+            name,
+            price_cents,
+            product_url,
+            image_url,
+        )
 
     return Item(
         item_id=item_id,
@@ -220,9 +341,52 @@ def parse_item_li(li: Tag) -> Item:
     )
 
 
+def _str_attr(tag: Tag | None, attr: str) -> str | None:
+    val = tag.get(attr) if tag is not None else None
+    return val if isinstance(val, str) else None
+
+
+def parse_item_li(li: Tag) -> Item:
+    """Parse a single wishlist item block (BeautifulSoup tag) into an Item."""
+    found = _scan_item_li(li)
+    raw_price_val = li.get("data-price")
+    pw = found.get("price_whole")
+    pf = found.get("price_fraction")
+    return _build_item(
+        item_id=str(li.get("id") or ""),
+        image_src=_str_attr(found.get("img"), "src"),
+        href=_str_attr(found.get("link"), "href"),
+        title=_text_or_empty(next((found[k] for k in _TITLE_KEYS if k in found), None)),
+        raw_price=str(raw_price_val) if isinstance(raw_price_val, (str, int, float)) else None,
+        price_whole=_text_or_empty(pw) if pw is not None else None,
+        price_fraction=_text_or_empty(pf) if pf is not None else None,
+    )
+
+
+def _node_text(node: LexborNode | None) -> str | None:
+    return node.text(strip=True) if node is not None else None
+
+
+def parse_item_node(node: LexborNode) -> Item:
+    """Parse a single wishlist item block (selectolax node) into an Item."""
+    img_el = node.css_first("img")
+    link_el = node.css_first("a[href*='/dp/']")
+    title_el = next((el for k in _TITLE_KEYS if (el := node.css_first(k)) is not None), None)
+    attrs = node.attributes
+    return _build_item(
+        item_id=attrs.get("id") or "",
+        image_src=img_el.attributes.get("src") if img_el is not None else None,
+        href=link_el.attributes.get("href") if link_el is not None else None,
+        title=_node_text(title_el) or "",
+        raw_price=attrs.get("data-price"),
+        price_whole=_node_text(node.css_first(".a-price-whole")),
+        price_fraction=_node_text(node.css_first(".a-price-fraction")),
+    )
+
+
 def extract_items_from_soup(soup: BeautifulSoup) -> list[Item]:
     """Extract items from Amazon mobile wishlist HTML soup."""
-    containers = soup.select("li.awl-item-wrapper, li.g-item-sortable, div.g-item-sortable")
+    containers = soup.select(_ITEM_CONTAINER_SELECTOR)
     logger.debug("Found %d Amazon item containers on page.", len(containers))
 
     items: list[Item] = []
@@ -234,22 +398,86 @@ def extract_items_from_soup(soup: BeautifulSoup) -> list[Item]:
     return items
 
 
+def _parse_page_bs4(html: bytes, seen_ids: Container[str] = ()) -> tuple[int, list[Item], str | None]:
+    """
+    Parse a wishlist page with BeautifulSoup: (container count, items, next-page token).
+
+    Blocks whose id is already in seen_ids are counted but not parsed.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    containers = soup.select(_ITEM_CONTAINER_SELECTOR)
+    items: list[Item] = []
+    for li in containers:
+        if str(li.get("id") or "") in seen_ids:
+            continue
+        try:
+            items.append(parse_item_li(li))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to parse an item block: %s", exc)
+    token = _str_attr(soup.select_one(_SHOW_MORE_SELECTOR), "value")
+    return len(containers), items, token
+
+
+def _parse_page_lexbor(html: bytes, seen_ids: Container[str] = ()) -> tuple[int, list[Item], str | None]:
+    """
+    Parse a wishlist page with selectolax: (container count, items, next-page token).
+
+    Blocks whose id is already in seen_ids are counted but not parsed.
+    """
+    tree = LexborHTMLParser(html)
+    containers = tree.css(_ITEM_CONTAINER_SELECTOR)
+    items: list[Item] = []
+    for node in containers:
+        if (node.attributes.get("id") or "") in seen_ids:
+            continue
+        try:
+            items.append(parse_item_node(node))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.debug("Failed to parse an item block: %s", exc)
+    token_el = tree.css_first(_SHOW_MORE_SELECTOR)
+    token = token_el.attributes.get("value") if token_el is not None else None
+    return len(containers), items, token
+
+
+_parse_page = _parse_page_bs4 if AMAZON_PARSER == "bs4" else _parse_page_lexbor
+
+
 def _apply_global_spacing(wishlist_name: str | None, identifier: str, page: int) -> None:
     """Apply global Amazon fetch spacing based on AMAZON_MIN_SPACING."""
-    global _last_amazon_fetch_ts
-    now = time.time()
-    since_last = now - _last_amazon_fetch_ts
-    if since_last < AMAZON_MIN_SPACING:
-        wait_for = AMAZON_MIN_SPACING - since_last
+    wait_for = _AMAZON_LIMITER.reserve()
+    if wait_for > 0:
         logger.info(
-            "Amazon fetch spacing: last request %.1fs ago; waiting %.1fs before fetching '%s' (page %d).",
-            since_last,
+            "Amazon fetch spacing: waiting %.1fs before fetching '%s' (page %d).",
             wait_for,
             wishlist_name or identifier,
             page,
         )
         time.sleep(wait_for)
-    _last_amazon_fetch_ts = time.time()
+
+
+def _adapt_spacing(throttled: bool) -> None:
+    """
+    Adjust the global fetch spacing AIMD-style: double it (up to
+    AMAZON_MAX_SPACING) when Amazon throttles or CAPTCHAs us, and ease it
+    back down by a second per clean page, never below AMAZON_MIN_SPACING.
+    """
+    current = _AMAZON_LIMITER.interval
+    if throttled:
+        new = min(max(current * 2, 1), max(AMAZON_MAX_SPACING, AMAZON_MIN_SPACING))
+        if new != current:
+            logger.warning("Amazon is throttling; raising fetch spacing to %.0fs.", new)
+    else:
+        new = max(current - 1, AMAZON_MIN_SPACING)
+        if new != current:
+            logger.debug("Lowering Amazon fetch spacing to %.0fs.", new)
+    _AMAZON_LIMITER.interval = new
+
+
+def _sleep_until(deadline: float) -> None:
+    """Sleep for whatever part of a time.monotonic() deadline is still ahead."""
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
 
 
 def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]:
@@ -260,8 +488,6 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
       - a full URL like https://www.amazon.com/hz/wishlist/ls/XYZ
       - a bare wishlist ID like XYZ
     """
-    session = requests.Session()
-
     if identifier.startswith("http://") or identifier.startswith("https://"):
         first_url = normalize_wishlist_url(identifier)
     else:
@@ -270,19 +496,10 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
 
     logger.info("Checking Amazon wishlist '%s' at %s", wishlist_name or identifier, first_url)
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) "
-            "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 "
-            "Mobile/15A372 Safari/604.1"
-        ),
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Referer": "https://www.amazon.com/",
-    }
-
     all_items: list[Item] = []
     seen_ids: set[str] = set()
+    # Every page URL requested so far, so pagination cycles stop before refetching
+    seen_urls: set[str] = {first_url}
     next_url: str | None = first_url
     page = 0
 
@@ -291,12 +508,13 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
 
         current_url = next_url
         attempt = 0
-        html: str | None = None
+        html: bytes | None = None
 
         while True:
             try:
-                html = fetch_page_raw(session, current_url, headers=headers)
+                html = fetch_page_raw(_SESSION, current_url)
                 if looks_like_captcha_or_block(html):
+                    _adapt_spacing(True)
                     attempt += 1
                     if attempt >= AMAZON_MAX_PAGE_RETRIES:
                         logger.warning(
@@ -316,8 +534,11 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
                     )
                     time.sleep(sleep_for)
                     continue
+                _adapt_spacing(False)
                 break
             except (requests.RequestException, AmazonError) as exc:
+                if isinstance(exc, AmazonError) and exc.status in (429, 503):
+                    _adapt_spacing(True)
                 attempt += 1
                 if attempt >= AMAZON_MAX_PAGE_RETRIES:
                     logger.error(
@@ -329,7 +550,13 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
                         exc,
                     )
                     return all_items
-                sleep_for = random.uniform(FAIL_SLEEP * 0.5, FAIL_SLEEP * 1.5)
+                # Exponential backoff: each failed attempt doubles the base
+                # delay, up to the CAPTCHA backoff as a ceiling
+                backoff = min(FAIL_SLEEP * 2 ** (attempt - 1), CAPTCHA_SLEEP)
+                sleep_for = random.uniform(backoff * 0.5, backoff * 1.5)
+                if isinstance(exc, AmazonError) and exc.retry_after is not None:
+                    # Honour Retry-After, capped so a bogus value can't stall the run
+                    sleep_for = max(sleep_for, min(exc.retry_after, CAPTCHA_SLEEP))
                 logger.warning(
                     "Error fetching Amazon page %s for wishlist '%s' (attempt %d/%d): %s. "
                     "Sleeping %.1fs before retry.",
@@ -351,12 +578,14 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
             )
             return all_items
 
+        # The inter-page pause starts now, so parsing time counts towards it
+        page_deadline = time.monotonic() + random.uniform(PAGE_SLEEP * 0.5, PAGE_SLEEP * 1.5)
+
         _dump_html(wishlist_name, page, html)
 
-        soup = BeautifulSoup(html, "html.parser")
-        li_nodes = soup.select("li.awl-item-wrapper, li.g-item-sortable, div.g-item-sortable")
+        container_count, page_items, token_val = _parse_page(html, seen_ids)
 
-        if not li_nodes:
+        if not container_count:
             logger.info(
                 "No item containers found on Amazon wishlist '%s' page %d; ending pagination.",
                 wishlist_name or identifier,
@@ -365,12 +594,7 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
             break
 
         page_new_count = 0
-        for li in li_nodes:
-            try:
-                item = parse_item_li(li)
-            except Exception as exc:
-                logger.debug("Failed to parse item on wishlist '%s' page %d: %s", wishlist_name or identifier, page, exc)
-                continue
+        for item in page_items:
             if item.item_id in seen_ids:
                 continue
             seen_ids.add(item.item_id)
@@ -394,21 +618,25 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> list[Item]
             )
             break
 
-        # Find next pagination token from mobile wishlist hidden form
-        token_input = soup.select_one("form.scroll-state input.showMoreUrl")
-        token_val = token_input.get("value") if token_input is not None else None
-
-        if isinstance(token_val, str) and token_val:
+        # Next pagination token comes from the mobile wishlist hidden form
+        if token_val:
             next_url = ensure_absolute_url(token_val)
+            if next_url in seen_urls:
+                logger.info(
+                    "Amazon wishlist '%s' pagination looped back to %s; pagination complete.",
+                    wishlist_name or identifier,
+                    next_url,
+                )
+                break
+            seen_urls.add(next_url)
             page += 1
-            sleep_for = random.uniform(PAGE_SLEEP * 0.5, PAGE_SLEEP * 1.5)
             logger.debug(
                 "Sleeping %.1fs before fetching next Amazon wishlist page %d for '%s'.",
-                sleep_for,
+                max(0.0, page_deadline - time.monotonic()),
                 page,
                 wishlist_name or identifier,
             )
-            time.sleep(sleep_for)
+            _sleep_until(page_deadline)
         else:
             logger.debug(
                 "No further pages (no showMoreUrl) for Amazon wishlist '%s'; pagination complete.",
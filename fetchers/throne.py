@@ -1,6 +1,6 @@
 # fetchers/throne.py
 import os
-import datetime
+import time
 import logging
 import re
 import hashlib
@@ -8,7 +8,7 @@ from typing import List, Optional
 
 import requests
 from bs4 import BeautifulSoup, Tag
-import json
+import orjson
 from tenacity import retry, wait_exponential_jitter, stop_after_attempt, RetryError
 
 from core.models import Item
@@ -22,7 +22,7 @@ def _dump_html_debug(wishlist_name: str | None, html: str) -> None:
         return
     try:
         os.makedirs(DEBUG_DIR, exist_ok=True)
-        ts = datetime.datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        ts = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
         safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", wishlist_name or "unknown")
         path = os.path.join(DEBUG_DIR, f"throne_{safe}_{ts}.html")
         with open(path, "w", encoding="utf-8") as f:
@@ -33,6 +33,8 @@ def _dump_html_debug(wishlist_name: str | None, html: str) -> None:
 
 
 
+BASE_URL = "https://throne.com"
+
 USER_AGENT = os.getenv(
     "THRONE_USER_AGENT",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
@@ -49,55 +51,56 @@ if PROXY_URL:
 
 
 def _normalize_target(target: str) -> str:
-    if target.startswith("http://") or target.startswith("https://"):
+    if target.startswith(("http://", "https://")):
         return target
-    return f"https://throne.com/{target}"
+    return f"{BASE_URL}/{target}"
 
 
 @retry(wait=wait_exponential_jitter(initial=1, max=30), stop=stop_after_attempt(5))
 def _fetch(url: str) -> str:
+    # Decoded text, so the Content-Type charset wins; bs4 hands a str to lxml
+    # as-is, whereas bytes would go through its own charset sniffing
     r = SESSION.get(url, timeout=30)
     r.raise_for_status()
     return r.text
 
 
-def _extract_items_next_data(html: str) -> Optional[List[Item]]:
-    soup = BeautifulSoup(html, "html.parser")
+def _is_item_list(lst: list) -> bool:
+    """True if any element looks like a Throne item (a name plus a price)."""
+    for x in lst:
+        if (
+            isinstance(x, dict)
+            and ("name" in x or "title" in x)
+            and ("price" in x or "price_cents" in x or "priceCents" in x)
+        ):
+            return True
+    return False
+
+
+def _extract_items_next_data(soup: BeautifulSoup) -> Optional[List[Item]]:
     script = soup.find("script", id="__NEXT_DATA__")
     if not script or not script.string:
         return None
     try:
-        data = json.loads(script.string)
+        # str() because orjson rejects str subclasses like bs4's Script
+        data = orjson.loads(str(script.string))
     except Exception:
         return None
 
-    found = []
-
-    def is_item_list(lst):
-        if not isinstance(lst, list):
-            return False
-        count = 0
-        for x in lst:
-            if isinstance(x, dict) and (
-                ("name" in x or "title" in x)
-                and any(k in x for k in ("price", "price_cents", "priceCents"))
-            ):
-                count += 1
-        return count >= 1
-
-    def deep_iter(node):
-        nonlocal found
-        if isinstance(node, dict):
-            for v in node.values():
-                deep_iter(v)
-        elif isinstance(node, list):
-            if is_item_list(node):
+    # Walk the JSON with an explicit stack rather than recursion. Popping
+    # from the end visits siblings last-first, so the first list hit is the
+    # last item list in document order, as with the old recursive walk
+    found = None
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if _is_item_list(node):
                 found = node
-                return
-            for v in node:
-                deep_iter(v)
-
-    deep_iter(data)
+                break
+            stack.extend(node)
+        elif isinstance(node, dict):
+            stack.extend(node.values())
     if not found:
         return None
 
@@ -170,7 +173,7 @@ def _extract_items_next_data(html: str) -> Optional[List[Item]]:
                     .replace(",", "")
                 )
                 try:
-                    if re.fullmatch(r"\d+", s):
+                    if s.isdigit():
                         v = int(s)
                         price_cents = (
                             v if v > 1000 else int(round(v * 100))
@@ -197,12 +200,11 @@ def _extract_items_next_data(html: str) -> Optional[List[Item]]:
     return items
 
 
-def _extract_items_jsonld(html: str) -> Optional[List[Item]]:
-    soup = BeautifulSoup(html, "html.parser")
+def _extract_items_jsonld(soup: BeautifulSoup) -> Optional[List[Item]]:
     out: List[Item] = []
     for script in soup.find_all("script", type="application/ld+json"):
         try:
-            data = json.loads(script.string or "")
+            data = orjson.loads(str(script.string or ""))
         except Exception:
             continue
         data_list = data if isinstance(data, list) else [data]
@@ -260,37 +262,31 @@ def _extract_items_jsonld(html: str) -> Optional[List[Item]]:
                     )
     if not out:
         return None
-    uniq: dict[str, Item] = {}
-    for it in out:
-        uniq[it.item_id] = it
-    return list(uniq.values())
+    return list({it.item_id: it for it in out}.values())
+
+
+# Currency symbol plus amount, e.g. "$12.99" or "€ 5,00"
+_PRICE_RE = re.compile(r"(?<!\w)([$€£])\s?([0-9]+(?:[.,][0-9]{2})?)")
+# Navigation/footer link texts that are never wishlist items
+_GRID_SKIP_RE = re.compile(
+    r"login|sign up|about|contact|faq|feature requests|how it works"
+    r"|follow|wishlist|gifters"
+)
 
 
-def _extract_items_grid(html: str) -> Optional[List[Item]]:
-    soup = BeautifulSoup(html, "html.parser")
+def _extract_items_grid(soup: BeautifulSoup) -> Optional[List[Item]]:
     items: List[Item] = []
-    price_re = re.compile(r"(?<!\w)([$€£])\s?([0-9]+(?:[.,][0-9]{2})?)")
+    # Links in the same card share ancestors; flatten each ancestor's text
+    # once per page instead of once per link (keyed by id(), the soup keeps
+    # every tag alive)
+    text_cache: dict[int, str] = {}
 
     for a in soup.find_all("a", href=True):
         txt = a.get_text(" ", strip=True)
+        text_cache[id(a)] = txt
         if not txt or len(txt) < 3:
             continue
-        lower = txt.lower()
-        if any(
-            k in lower
-            for k in (
-                "login",
-                "sign up",
-                "about",
-                "contact",
-                "faq",
-                "feature requests",
-                "how it works",
-                "follow",
-                "wishlist",
-                "gifters",
-            )
-        ):
+        if _GRID_SKIP_RE.search(txt.lower()):
             continue
 
         price_cents = -1
@@ -300,8 +296,10 @@ def _extract_items_grid(html: str) -> Optional[List[Item]]:
         for _ in range(4):
             if container is None:
                 break
-            text_block = container.get_text(" ", strip=True)
-            m = price_re.search(text_block or "")
+            text_block = text_cache.get(id(container))
+            if text_block is None:
+                text_block = text_cache[id(container)] = container.get_text(" ", strip=True)
+            m = _PRICE_RE.search(text_block)
             if m:
                 symbol, num = m.groups()
                 if symbol == "€":
@@ -328,9 +326,7 @@ def _extract_items_grid(html: str) -> Optional[List[Item]]:
         if not isinstance(href_raw, str):
             continue
         
-        href = href_raw
-        if href.startswith("/"):
-            href = "https://throne.com" + href
+        href = BASE_URL + href_raw if href_raw.startswith("/") else href_raw
         key = href or txt
         item_id = hashlib.sha1(key.encode()).hexdigest()
 
@@ -349,10 +345,7 @@ def _extract_items_grid(html: str) -> Optional[List[Item]]:
     if not items:
         return None
 
-    uniq: dict[str, Item] = {}
-    for it in items:
-        uniq[it.item_id] = it
-    return list(uniq.values())
+    return list({it.item_id: it for it in items}.values())
 
 
 def fetch_items(identifier: str, wishlist_name: str | None = None) -> Optional[List[Item]]:
@@ -373,13 +366,15 @@ def fetch_items(identifier: str, wishlist_name: str | None = None) -> Optional[L
         logger.error("Throne fetch threw unexpected exception for %s: %s", url, e)
         return None
 
-    items = _extract_items_next_data(html)
+    # Parse once and share the tree between the fallback extractors
+    soup = BeautifulSoup(html, "lxml")
+    items = _extract_items_next_data(soup)
     if not items:
         logger.debug("Throne NEXT_DATA extraction failed or empty; trying JSON-LD")
-        items = _extract_items_jsonld(html)
+        items = _extract_items_jsonld(soup)
     if not items:
         logger.debug("Throne JSON-LD extraction failed or empty; trying grid")
-        items = _extract_items_grid(html)
+        items = _extract_items_grid(soup)
 
     if not items:
         if logger.isEnabledFor(logging.DEBUG):
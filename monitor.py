@@ -1,14 +1,19 @@
 import os
-import json
+import logging
 import time
 import random
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from core.logger import get_logger
 from core import storage
 from core.diff import diff_items
 from core.report_html import build_html_report
-from core.emailer import send_email, get_global_recipients
+from core.emailer import SMTPSession, compile_recipient_set, send_email
+from core.models import Item
 from fetchers import FETCHERS
 
 logger = get_logger(__name__)
@@ -17,6 +22,9 @@ POLL_MINUTES = int(os.getenv("POLL_MINUTES", "10"))
 MODE = os.getenv("MODE", "daemon").lower()  # "daemon" or "once"
 CONFIG_PATH = os.getenv("CONFIG_PATH", "/data/config.json")
 
+# (path, st_mtime_ns, config) from the last successful load_config call
+_config_cache: Tuple[str, int, Dict[str, Any]] | None = None
+
 
 def _wishlist_url(platform: str, identifier: str) -> str | None:
     platform = platform.strip().lower()
@@ -31,21 +39,30 @@ def _wishlist_url(platform: str, identifier: str) -> str | None:
     return None
 
 
-def jitter_sleep_minutes(minutes: int) -> None:
-    base = max(1, minutes)
-    jitter = random.uniform(-0.1 * base, 0.1 * base)
+def jitter_sleep_minutes(minutes: float) -> None:
+    base = max(1.0, minutes)
+    # Late-only jitter: minutes is when the next wishlist falls due, and
+    # waking early would just run an empty cycle
+    jitter = random.uniform(0, 0.1 * base)
     total = base + jitter
     logger.info("Sleeping %.1f minutes before next cycle.", total)
     time.sleep(total * 60)
 
 
 def load_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
-    if not os.path.exists(path):
+    """Load and validate the config, reusing the last result while the file is unchanged."""
+    global _config_cache
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
         logger.error("Config file not found at %s", path)
         raise SystemExit(1)
+    if _config_cache is not None and _config_cache[:2] == (path, mtime_ns):
+        return _config_cache[2]
+
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            cfg: Dict[str, Any] = json.load(f)
+        with open(path, "rb") as f:
+            cfg: Dict[str, Any] = orjson.loads(f.read())
     except Exception as e:
         logger.error("Failed to load config.json at %s: %s", path, e)
         raise SystemExit(1)
@@ -58,39 +75,107 @@ def load_config(path: str = CONFIG_PATH) -> Dict[str, Any]:
         logger.error("config.json 'wishlists' must be a non-empty list.")
         raise SystemExit(1)
 
+    _config_cache = (path, mtime_ns, cfg)
     return cfg
 
 
 def get_recipients_for_wishlist(wl: Dict[str, Any]) -> List[str]:
     wl_recipients = wl.get("recipients")
-    if isinstance(wl_recipients, list):
-        cleaned = [r.strip() for r in wl_recipients if isinstance(r, str) and r.strip()]
-        if cleaned:
-            return cleaned
-    return get_global_recipients()
-
+    if not isinstance(wl_recipients, list):
+        wl_recipients = []
+    return list(compile_recipient_set(wl_recipients))
+
+
+@dataclass(slots=True, frozen=True)
+class WishlistSpec:
+    """
+    A validated config.json wishlist entry, normalized once per config load
+    so the polling loop doesn't re-strip, re-validate and re-resolve it.
+    """
+    platform: str
+    name: str
+    identifier: str
+    poll_minutes: int
+    fetcher: Callable[[str, str | None], Optional[List[Item]]]
+    recipients: Tuple[str, ...]
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.platform, self.name)
+
+
+def _poll_minutes(wl: Dict[str, Any]) -> int:
+    """Effective poll interval of a wishlist: its poll_minutes, else POLL_MINUTES."""
+    poll_val = wl.get("poll_minutes")
+    try:
+        poll_minutes = int(poll_val) if poll_val is not None else POLL_MINUTES
+    except Exception:
+        poll_minutes = POLL_MINUTES
+    return max(1, poll_minutes)
 
-def process_wishlist(wl: Dict[str, Any]) -> None:
-    platform = wl.get("platform", "").strip().lower()
-    name = wl.get("name", "").strip()
-    identifier = wl.get("identifier", "").strip()
-    enabled = wl.get("enabled", True)
 
-    if not platform or not name or not identifier:
-        logger.error("Invalid wishlist entry (missing platform/name/identifier): %s", wl)
-        return
+def _str_field(wl: Dict[str, Any], field: str) -> str:
+    value = wl.get(field)
+    return value.strip() if isinstance(value, str) else ""
 
-    if not enabled:
-        logger.info("Wishlist '%s' (%s) is disabled; skipping.", name, platform)
-        return
 
-    fetcher = FETCHERS.get(platform)
-    if not fetcher:
-        logger.error(
-            "No fetcher registered for platform '%s'; skipping wishlist '%s'.",
-            platform, name,
+def build_wishlist_specs(wishlists: List[Any]) -> List[WishlistSpec]:
+    """Validate raw config entries, logging and dropping unusable ones."""
+    specs: List[WishlistSpec] = []
+    for wl in wishlists:
+        if not isinstance(wl, dict):
+            logger.error("Invalid WL entry: %s", wl)
+            continue
+
+        platform = _str_field(wl, "platform").lower()
+        name = _str_field(wl, "name")
+        identifier = _str_field(wl, "identifier")
+        if not platform or not name or not identifier:
+            logger.error("Invalid wishlist entry (missing platform/name/identifier): %s", wl)
+            continue
+
+        if not wl.get("enabled", True):
+            logger.info("Wishlist '%s' (%s) is disabled; skipping.", name, platform)
+            continue
+
+        fetcher = FETCHERS.get(platform)
+        if not fetcher:
+            logger.error(
+                "No fetcher registered for platform '%s'; skipping wishlist '%s'.",
+                platform, name,
+            )
+            continue
+
+        specs.append(
+            WishlistSpec(
+                platform=platform,
+                name=name,
+                identifier=identifier,
+                poll_minutes=_poll_minutes(wl),
+                fetcher=fetcher,
+                recipients=tuple(get_recipients_for_wishlist(wl)),
+            )
         )
-        return
+    return specs
+
+
+# (config, specs built from it) from the last load_wishlists call
+_specs_cache: Tuple[Dict[str, Any], List[WishlistSpec]] | None = None
+
+
+def load_wishlists(path: str = CONFIG_PATH) -> List[WishlistSpec]:
+    """Wishlist specs for the current config, rebuilt only when the config changes."""
+    global _specs_cache
+    cfg = load_config(path)
+    if _specs_cache is None or _specs_cache[0] is not cfg:
+        _specs_cache = (cfg, build_wishlist_specs(cfg["wishlists"]))
+    return _specs_cache[1]
+
+
+def process_wishlist(spec: WishlistSpec, smtp: SMTPSession | None = None) -> None:
+    platform = spec.platform
+    name = spec.name
+    identifier = spec.identifier
 
     wishlist_id = identifier
     logger.info(
@@ -101,7 +186,7 @@ def process_wishlist(wl: Dict[str, Any]) -> None:
     previous_items = storage.get_previous_items(platform, wishlist_id)
     previous_count = len(previous_items)
 
-    items = fetcher(identifier, name)
+    items = spec.fetcher(identifier, name)
     if not items:
         if previous_count > 0:
             logger.error(
@@ -119,7 +204,8 @@ def process_wishlist(wl: Dict[str, Any]) -> None:
     new_count = len(items)
 
     storage.save_items_and_events(
-        platform, wishlist_id, items, added, removed, price_changes
+        platform, wishlist_id, items, added, removed, price_changes,
+        previous=previous_items,
     )
 
     if not (added or removed or price_changes):
@@ -139,123 +225,160 @@ def process_wishlist(wl: Dict[str, Any]) -> None:
         wishlist_url=_wishlist_url(platform, identifier),
     )
 
-    recipients = get_recipients_for_wishlist(wl)
+    recipients = list(spec.recipients)
     if not recipients:
         logger.error("No recipients for wishlist '%s' (platform=%s).", name, platform)
         return
 
-    send_email(subject, html_body, None, recipients)
+    send_email(subject, html_body, None, recipients, session=smtp)
 
 
-def _wishlist_debug_id(wl: Dict[str, Any]) -> str:
-    platform = wl.get("platform", "").strip().lower()
-    name = wl.get("name", "").strip()
-    if not platform and not name:
-        return "<invalid>"
-    return f"{platform}:{name}"
+def _wishlist_debug_id(spec: WishlistSpec) -> str:
+    return f"{spec.platform}:{spec.name}"
 
 
-def _debug_log_wishlist_order(phase: str, wishlists: List[Dict[str, Any]]) -> None:
-    try:
-        order = [_wishlist_debug_id(wl) for wl in wishlists if isinstance(wl, dict)]
-    except Exception:
-        order = ["<error>"]
-    logger.debug("%s wishlist order: %s", phase, order)
+def _debug_log_wishlist_order(phase: str, specs: List[WishlistSpec]) -> None:
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("%s wishlist order: %s", phase, [_wishlist_debug_id(spec) for spec in specs])
+
+
+def _process_lane(
+    specs: List[WishlistSpec],
+    last_run_map: Dict[Tuple[str, str], float] | None = None,
+) -> None:
+    """Process one platform's wishlists in order, sharing one SMTP session."""
+    with SMTPSession() as smtp:
+        for spec in specs:
+            try:
+                process_wishlist(spec, smtp)
+            except Exception as e:
+                logger.exception("Error processing %s: %s", _wishlist_debug_id(spec), e)
+            finally:
+                if last_run_map is not None:
+                    last_run_map[spec.key] = time.monotonic()
+
+
+def _lane_pool() -> ThreadPoolExecutor:
+    """
+    Worker pool for the platform lanes, one worker per known platform.
+
+    Callers keep it for their whole lifetime: idle workers are reused across
+    cycles, so each keeps its thread-local SQLite connection (and page cache)
+    instead of a fresh thread reconnecting every poll.
+    """
+    return ThreadPoolExecutor(max_workers=max(1, len(FETCHERS)), thread_name_prefix="wl")
+
+
+def _process_by_platform(
+    specs: List[WishlistSpec],
+    pool: ThreadPoolExecutor,
+    last_run_map: Dict[Tuple[str, str], float] | None = None,
+) -> None:
+    """
+    Run each platform's wishlists concurrently with the other platforms.
+
+    Within a platform wishlists stay sequential (keeping per-site spacing such
+    as AMAZON_MIN_SPACING intact); across platforms their network waits and
+    sleeps overlap.
+    """
+    lanes: Dict[str, List[WishlistSpec]] = {}
+    for spec in specs:
+        lanes.setdefault(spec.platform, []).append(spec)
+
+    for future in [pool.submit(_process_lane, lane, last_run_map) for lane in lanes.values()]:
+        future.result()
 
 
 def run_once() -> int:
     storage.ensure_db()
-    cfg = load_config()
-    wishlists = cfg.get("wishlists", [])
+    specs = list(load_wishlists())
 
-    _debug_log_wishlist_order("run_once BEFORE shuffle", wishlists)
-    random.shuffle(wishlists)
-    _debug_log_wishlist_order("run_once AFTER shuffle", wishlists)
+    _debug_log_wishlist_order("run_once BEFORE shuffle", specs)
+    random.shuffle(specs)
+    _debug_log_wishlist_order("run_once AFTER shuffle", specs)
 
-    for wl in wishlists:
-        try:
-            process_wishlist(wl)
-        except Exception as e:
-            logger.exception("Unhandled error in run_once: %s", e)
+    with _lane_pool() as pool:
+        _process_by_platform(specs, pool)
 
     return 0
 
 
+def _is_due(spec: WishlistSpec, last_run_map: Dict[Tuple[str, str], float], now: float) -> bool:
+    """
+    True if spec's poll interval has elapsed since its last run
+    (last_run_map and now are time.monotonic() values).
+    """
+    last_ts = last_run_map.get(spec.key)
+    if last_ts:
+        elapsed = (now - last_ts) / 60
+        if elapsed < spec.poll_minutes:
+            logger.debug(
+                "Skip %s:%s (%.1f < %d minutes).",
+                spec.platform, spec.name, elapsed, spec.poll_minutes,
+            )
+            return False
+
+    logger.debug(
+        "Processing WL %s:%s (poll_minutes=%d).",
+        spec.platform, spec.name, spec.poll_minutes,
+    )
+    return True
+
+
+def _minutes_until_next_due(
+    specs: List[WishlistSpec],
+    last_run_map: Dict[Tuple[str, str], float],
+    now: float,
+) -> float:
+    """
+    Minutes until the earliest wishlist falls due, capped at POLL_MINUTES so
+    config edits (such as newly added wishlists) are still picked up.
+    """
+    wait = float(POLL_MINUTES)
+    for spec in specs:
+        last_ts = last_run_map.get(spec.key)
+        if last_ts is None:
+            continue
+        wait = min(wait, spec.poll_minutes - (now - last_ts) / 60)
+    return wait
+
+
 def run_daemon() -> None:
     logger.info("Starting daemon; poll every %d minutes.", POLL_MINUTES)
     storage.ensure_db()
     last_run_map: Dict[Tuple[str, str], float] = {}
+    # Lives as long as the daemon so lane threads (and their DB connections)
+    # carry over between cycles
+    pool = _lane_pool()
 
     while True:
+        specs: List[WishlistSpec] = []
         try:
-            cfg = load_config()
-            wishlists = cfg.get("wishlists", [])
-            now = time.time()
+            specs = load_wishlists()
+            now = time.monotonic()
 
-            seed = time.time_ns()
-            random.seed(seed)
             logger.debug(
-                "Daemon cycle start %s with seed %d (%d wishlists).",
-                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now)),
-                seed, len(wishlists),
+                "Daemon cycle start %s (%d wishlists).",
+                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                len(specs),
             )
 
-            _debug_log_wishlist_order("daemon BEFORE shuffle", wishlists)
-            random.shuffle(wishlists)
-            _debug_log_wishlist_order("daemon AFTER shuffle", wishlists)
+            # Filter first so only the due wishlists get shuffled and logged
+            due = [spec for spec in specs if _is_due(spec, last_run_map, now)]
 
-            logger.debug(
-                "Daemon processing order: %s",
-                [_wishlist_debug_id(wl) for wl in wishlists],
-            )
+            _debug_log_wishlist_order("daemon BEFORE shuffle", due)
+            random.shuffle(due)
+            _debug_log_wishlist_order("daemon AFTER shuffle", due)
 
-            for wl in wishlists:
-                if not isinstance(wl, dict):
-                    logger.error("Invalid WL entry: %s", wl)
-                    continue
-
-                platform = wl.get("platform", "").strip().lower()
-                name = wl.get("name", "").strip()
-                if not platform or not name:
-                    logger.error("Invalid WL (missing platform or name): %s", wl)
-                    continue
-
-                key = (platform, name)
-                poll_val = wl.get("poll_minutes")
-
-                try:
-                    poll_minutes = int(poll_val) if poll_val is not None else POLL_MINUTES
-                except Exception:
-                    poll_minutes = POLL_MINUTES
-
-                poll_minutes = max(1, poll_minutes)
-
-                last_ts = last_run_map.get(key)
-                if last_ts:
-                    elapsed = (now - last_ts) / 60
-                    if elapsed < poll_minutes:
-                        logger.debug(
-                            "Skip %s:%s (%.1f < %d minutes).",
-                            platform, name, elapsed, poll_minutes,
-                        )
-                        continue
-
-                logger.debug(
-                    "Processing WL %s:%s (poll_minutes=%d).",
-                    platform, name, poll_minutes,
-                )
-
-                try:
-                    process_wishlist(wl)
-                except Exception as e:
-                    logger.exception("Error processing %s:%s: %s", platform, name, e)
-                finally:
-                    last_run_map[key] = time.time()
+            _process_by_platform(due, pool, last_run_map)
 
         except Exception as e:
             logger.exception("Unhandled error in daemon loop: %s", e)
 
-        jitter_sleep_minutes(POLL_MINUTES)
+        # Wake when the next wishlist is due rather than a fixed POLL_MINUTES
+        # later, so shorter per-wishlist poll_minutes are honoured
+        jitter_sleep_minutes(_minutes_until_next_due(specs, last_run_map, time.monotonic()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+# tests/test_amazon_retry_after.py
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+
+_TMP = tempfile.mkdtemp()
+os.environ.setdefault("LOG_TO_FILE", "false")
+os.environ.setdefault("LOG_TO_STDOUT", "false")
+os.environ.setdefault("DEBUG_DIR", _TMP)
+
+from core.ratelimit import SpacingLimiter  # noqa: E402
+from fetchers import amazon  # noqa: E402
+
+
+class _ThrottlingHandler(BaseHTTPRequestHandler):
+    """Answers every request with 503 and a Retry-After header."""
+
+    hits = 0
+    retry_after = "3600"
+
+    def do_GET(self) -> None:
+        type(self).hits += 1
+        self.send_response(503)
+        self.send_header("Retry-After", type(self).retry_after)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class RetryAfterTest(unittest.TestCase):
+    server: HTTPServer
+    base_url: str
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = HTTPServer(("127.0.0.1", 0), _ThrottlingHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        # Send plain http through the same adapter the session uses for https
+        amazon._SESSION.mount("http://", amazon._SESSION.get_adapter("https://"))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        _ThrottlingHandler.hits = 0
+
+    def test_adapter_does_not_retry_or_sleep_on_retry_after(self) -> None:
+        # Short enough that a regression fails the timing check, not hangs
+        _ThrottlingHandler.retry_after = "2"
+        start = time.monotonic()
+        with self.assertRaises(amazon.AmazonError) as ctx:
+            amazon.fetch_page_raw(amazon._SESSION, f"{self.base_url}/")
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(_ThrottlingHandler.hits, 1)
+        self.assertEqual(ctx.exception.retry_after, 2.0)
+
+    def test_fetch_items_caps_retry_after_at_captcha_sleep(self) -> None:
+        _ThrottlingHandler.retry_after = "3600"
+        # time.sleep is patched module-wide, so any urllib3 sleep shows up too
+        sleeps: list[float] = []
+        with mock.patch.object(amazon, "BASE_URL", self.base_url), \
+                mock.patch.object(amazon, "CAPTCHA_SLEEP", 5), \
+                mock.patch.object(amazon, "FAIL_SLEEP", 1), \
+                mock.patch.object(amazon, "AMAZON_MAX_PAGE_RETRIES", 3), \
+                mock.patch.object(amazon, "_AMAZON_LIMITER", SpacingLimiter(0)), \
+                mock.patch.object(amazon.time, "sleep", sleeps.append):
+            items = amazon.fetch_items("WL123", "test")
+
+        self.assertEqual(items, [])
+        self.assertEqual(_ThrottlingHandler.hits, 3)
+        # Two retry sleeps: Retry-After raises each to CAPTCHA_SLEEP, no further
+        self.assertEqual(len(sleeps), 2)
+        for slept in sleeps:
+            self.assertGreaterEqual(slept, 5)
+            self.assertLessEqual(slept, 5 * 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()